@@ -10,6 +10,11 @@ import random
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+# Matches <@123456789> and <@!123456789>
+_DISCORD_MENTION_RE = re.compile(r'<@!?\d+>')
+# Matches @username style attempts at mentioning
+_AT_MENTION_RE = re.compile(r'@\w+')
+
 class StyleValidator:
     def __init__(self):
         self.style_profile = self.load_style_profile()
@@ -92,19 +97,12 @@ class StyleValidator:
     
     def remove_mentions(self, text: str) -> str:
         """Remove all mentions from the response (we'll use replies instead)"""
-        import re
-        
         # Remove all user mentions (we'll use Discord replies instead)
-        # Pattern matches <@123456789> and <@!123456789>
-        mention_pattern = r'<@!?\d+>'
-        text = re.sub(mention_pattern, '', text).strip()
+        text = _DISCORD_MENTION_RE.sub('', text)
         
         # Also remove any remaining @ symbols followed by usernames/words
         # This catches cases where LLM tries to mention without proper Discord format
-        text = re.sub(r'@\w+', '', text).strip()
-        
-        # Remove any text patterns that look like attempts to mention users
-        text = re.sub(r'@[a-zA-Z0-9_]+', '', text).strip()
+        text = _AT_MENTION_RE.sub('', text)
         
         # Clean up any double spaces left behind
         text = ' '.join(text.split())
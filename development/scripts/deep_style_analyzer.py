@@ -5,14 +5,101 @@ Comprehensive analysis of Discord messages to extract detailed writing patterns.
 """
 
 import json
+import logging
+import os
 import re
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 import statistics
 import string
 
+logger = logging.getLogger(__name__)
+
+# Common contractions and slang
+_CONTRACTIONS = ("don't", "can't", "won't", "isn't", "aren't", "wasn't", "weren't",
+                 "haven't", "hasn't", "hadn't", "wouldn't", "couldn't", "shouldn't",
+                 "i'm", "you're", "he's", "she's", "it's", "we're", "they're",
+                 "i've", "you've", "we've", "they've", "i'll", "you'll", "he'll",
+                 "she'll", "it'll", "we'll", "they'll", "i'd", "you'd", "he'd",
+                 "she'd", "it'd", "we'd", "they'd")
+
+_SLANG_TERMS = ("lol", "lmao", "bruh", "fr", "nah", "yah", "yeah", "ok", "omg",
+                "wtf", "tbh", "imo", "smh", "rip", "pog", "ez", "gg", "kek",
+                "sus", "cringe", "based", "lit", "fire", "cap", "no cap", "bet")
+
+_FILLER_WORDS = ("like", "um", "uh", "well", "so", "you know", "i mean", "basically")
+
+# Pattern words for each conversational category
+_AGREEMENT_WORDS = ("yes", "yeah", "yep", "true", "right", "exactly", "definitely", "absolutely")
+_DISAGREEMENT_WORDS = ("no", "nah", "nope", "wrong", "false", "disagree")
+_UNCERTAINTY_WORDS = ("maybe", "idk", "dunno", "not sure", "possibly", "perhaps")
+_ACKNOWLEDGMENT_WORDS = ("ok", "okay", "alright", "got it", "i see", "fair")
+_ENTHUSIASM_WORDS = ("awesome", "cool", "nice", "great", "amazing", "sick", "dope")
+_DISMISSAL_WORDS = ("whatever", "meh", "eh", "don't care", "who cares")
+
+_GREETING_WORDS = ("hi", "hello", "hey", "sup", "what's up", "howdy")
+_FAREWELL_WORDS = ("bye", "goodbye", "see ya", "later", "cya", "peace")
+_THANKS_WORDS = ("thanks", "thank you", "thx", "ty", "appreciate")
+_APOLOGY_WORDS = ("sorry", "my bad", "oops", "whoops", "apologize")
+
+_WH_WORDS = ("what", "where", "when", "why", "who", "how", "which")
+
+# Emotion word lists
+_POSITIVE_WORDS = ("good", "great", "awesome", "cool", "nice", "happy", "love", "like",
+                   "amazing", "fantastic", "wonderful", "excellent", "perfect", "fun")
+
+_NEGATIVE_WORDS = ("bad", "terrible", "awful", "hate", "dislike", "sad", "angry", "mad",
+                   "stupid", "dumb", "annoying", "frustrating", "boring", "sucks")
+
+_JOY_WORDS = ("happy", "joy", "excited", "thrilled", "delighted", "cheerful", "glad")
+_ANGER_WORDS = ("angry", "mad", "furious", "pissed", "annoyed", "irritated", "rage")
+_SADNESS_WORDS = ("sad", "depressed", "down", "upset", "disappointed", "hurt")
+
+# Topic keyword lists
+_GAMING_TERMS = ("game", "play", "level", "win", "lose", "boss", "character", "server",
+                 "raid", "guild", "pvp", "fps", "rpg", "strategy", "console", "pc",
+                 "steam", "discord", "minecraft", "fortnite", "apex", "valorant")
+
+_TECH_TERMS = ("computer", "phone", "app", "website", "internet", "wifi", "software",
+               "hardware", "code", "programming", "bug", "update", "download", "install")
+
+_SOCIAL_TERMS = ("friend", "friends", "family", "school", "work", "party", "hang out",
+                 "meet", "chat", "talk", "message", "call", "text")
+
+_TIME_TERMS = ("today", "yesterday", "tomorrow", "now", "later", "soon", "never",
+               "always", "morning", "afternoon", "evening", "night", "weekend")
+
+# Word -> context pattern key; earlier categories take precedence on overlap
+_TOPIC_MAP = {
+    word: category
+    for category, terms in reversed((('gaming_terms', _GAMING_TERMS),
+                                     ('tech_terms', _TECH_TERMS),
+                                     ('social_terms', _SOCIAL_TERMS),
+                                     ('time_references', _TIME_TERMS)))
+    for word in terms
+}
+
+# Capitalization pattern recorded for each first-character class
+_CAPITALIZATION_BY_CLASS = {
+    'uppercase': 'proper_start',
+    'lowercase': 'lowercase_start',
+    'digit': 'number_start',
+    'symbol': 'symbol_start'
+}
+
+def _char_class(char: str) -> str:
+    """Classify a character as uppercase, lowercase, digit or symbol"""
+    if char.isupper():
+        return 'uppercase'
+    if char.islower():
+        return 'lowercase'
+    if char.isdigit():
+        return 'digit'
+    return 'symbol'
+
 class DeepStyleAnalyzer:
     def __init__(self, messages_file: str):
         self.messages_file = messages_file
@@ -29,8 +116,8 @@ class DeepStyleAnalyzer:
         # Filter non-empty messages for most analyses
         self.non_empty_messages = [msg for msg in self.messages if msg['content'].strip()]
         
-        print(f"✅ Loaded {len(self.messages)} total messages")
-        print(f"✅ {len(self.non_empty_messages)} non-empty messages for analysis")
+        logger.info("✅ Loaded %d total messages", len(self.messages))
+        logger.info("✅ %d non-empty messages for analysis", len(self.non_empty_messages))
         
     def analyze_message_structure(self) -> Dict[str, Any]:
         """Deep analysis of message structure patterns"""
@@ -55,20 +142,6 @@ class DeepStyleAnalyzer:
             }
         }
         
-        # Common contractions and slang
-        contractions = ["don't", "can't", "won't", "isn't", "aren't", "wasn't", "weren't", 
-                       "haven't", "hasn't", "hadn't", "wouldn't", "couldn't", "shouldn't",
-                       "i'm", "you're", "he's", "she's", "it's", "we're", "they're",
-                       "i've", "you've", "we've", "they've", "i'll", "you'll", "he'll",
-                       "she'll", "it'll", "we'll", "they'll", "i'd", "you'd", "he'd",
-                       "she'd", "it'd", "we'd", "they'd"]
-        
-        slang_terms = ["lol", "lmao", "bruh", "fr", "nah", "yah", "yeah", "ok", "omg", 
-                      "wtf", "tbh", "imo", "smh", "rip", "pog", "ez", "gg", "kek",
-                      "sus", "cringe", "based", "lit", "fire", "cap", "no cap", "bet"]
-        
-        filler_words = ["like", "um", "uh", "well", "so", "you know", "i mean", "basically"]
-        
         for msg in self.non_empty_messages:
             content = msg['content'].strip()
             content_lower = content.lower()
@@ -78,53 +151,38 @@ class DeepStyleAnalyzer:
             structures['sentence_count_distribution'][sentence_count] += 1
             
             # Start patterns
-            if content:
-                first_char = content[0]
-                if first_char.isupper():
-                    structures['starts_with_patterns']['uppercase'] += 1
-                elif first_char.islower():
-                    structures['starts_with_patterns']['lowercase'] += 1
-                elif first_char.isdigit():
-                    structures['starts_with_patterns']['digit'] += 1
-                else:
-                    structures['starts_with_patterns']['symbol'] += 1
+            start_class = _char_class(content[0])
+            structures['starts_with_patterns'][start_class] += 1
             
             # End patterns
-            if content:
-                last_char = content[-1]
-                if last_char in '.!?':
-                    structures['ends_with_patterns'][last_char] += 1
-                elif last_char.isalnum():
-                    structures['ends_with_patterns']['no_punctuation'] += 1
-                else:
-                    structures['ends_with_patterns']['other_symbol'] += 1
+            last_char = content[-1]
+            if last_char in '.!?':
+                structures['ends_with_patterns'][last_char] += 1
+            elif last_char.isalnum():
+                structures['ends_with_patterns']['no_punctuation'] += 1
+            else:
+                structures['ends_with_patterns']['other_symbol'] += 1
             
             # Capitalization analysis
             if content.isupper() and len(content) > 1:
                 structures['capitalization_patterns']['all_caps'] += 1
             elif content.islower():
                 structures['capitalization_patterns']['all_lowercase'] += 1
-            elif content[0].isupper():
-                structures['capitalization_patterns']['proper_start'] += 1
-            elif content[0].islower():
-                structures['capitalization_patterns']['lowercase_start'] += 1
-            elif content[0].isdigit():
-                structures['capitalization_patterns']['number_start'] += 1
             else:
-                structures['capitalization_patterns']['symbol_start'] += 1
+                structures['capitalization_patterns'][_CAPITALIZATION_BY_CLASS[start_class]] += 1
             
             # Grammar patterns
-            for contraction in contractions:
+            for contraction in _CONTRACTIONS:
                 if contraction in content_lower:
                     structures['grammar_patterns']['contractions'] += 1
                     break
             
-            for slang in slang_terms:
+            for slang in _SLANG_TERMS:
                 if slang in content_lower:
                     structures['grammar_patterns']['slang_terms'] += 1
                     break
             
-            for filler in filler_words:
+            for filler in _FILLER_WORDS:
                 if filler in content_lower:
                     structures['grammar_patterns']['filler_words'] += 1
                     break
@@ -152,13 +210,12 @@ class DeepStyleAnalyzer:
         intensifiers = ["very", "really", "super", "extremely", "totally", "absolutely", "quite"]
         hedging_words = ["maybe", "probably", "perhaps", "sort of", "kind of", "i think", "i guess"]
         
-        all_words = []
-        all_sentences = []
+        word_freq = Counter()
         
         for msg in self.non_empty_messages:
             content = msg['content'].strip()
             words = re.findall(r'\b\w+\b', content.lower())
-            all_words.extend(words)
+            word_freq.update(words)
             
             # Word length distribution
             for word in words:
@@ -188,7 +245,6 @@ class DeepStyleAnalyzer:
                     patterns['repetition_patterns']['word_doubling'] += 1
         
         # Repeated words analysis
-        word_freq = Counter(all_words)
         patterns['repetition_patterns']['repeated_words'] = word_freq.most_common(50)
         
         return patterns
@@ -225,82 +281,70 @@ class DeepStyleAnalyzer:
             }
         }
         
-        # Pattern words for each category
-        agreement_words = ["yes", "yeah", "yep", "true", "right", "exactly", "definitely", "absolutely"]
-        disagreement_words = ["no", "nah", "nope", "wrong", "false", "disagree"]
-        uncertainty_words = ["maybe", "idk", "dunno", "not sure", "possibly", "perhaps"]
-        acknowledgment_words = ["ok", "okay", "alright", "got it", "i see", "fair"]
-        enthusiasm_words = ["awesome", "cool", "nice", "great", "amazing", "sick", "dope"]
-        dismissal_words = ["whatever", "meh", "eh", "don't care", "who cares"]
-        
-        greeting_words = ["hi", "hello", "hey", "sup", "what's up", "howdy"]
-        farewell_words = ["bye", "goodbye", "see ya", "later", "cya", "peace"]
-        thanks_words = ["thanks", "thank you", "thx", "ty", "appreciate"]
-        apology_words = ["sorry", "my bad", "oops", "whoops", "apologize"]
-        
-        wh_words = ["what", "where", "when", "why", "who", "how", "which"]
+        response_patterns = conversation['response_patterns']
+        social_functions = conversation['social_functions']
         
         for msg in self.non_empty_messages:
             content_lower = msg['content'].lower()
             
             # Response patterns
-            for word in agreement_words:
+            for word in _AGREEMENT_WORDS:
                 if word in content_lower:
-                    conversation['response_patterns']['agreement'] += 1
+                    response_patterns['agreement'] += 1
                     break
             
-            for word in disagreement_words:
+            for word in _DISAGREEMENT_WORDS:
                 if word in content_lower:
-                    conversation['response_patterns']['disagreement'] += 1
+                    response_patterns['disagreement'] += 1
                     break
             
-            for word in uncertainty_words:
+            for word in _UNCERTAINTY_WORDS:
                 if word in content_lower:
-                    conversation['response_patterns']['uncertainty'] += 1
+                    response_patterns['uncertainty'] += 1
                     break
             
-            for word in acknowledgment_words:
+            for word in _ACKNOWLEDGMENT_WORDS:
                 if word in content_lower:
-                    conversation['response_patterns']['acknowledgment'] += 1
+                    response_patterns['acknowledgment'] += 1
                     break
             
-            for word in enthusiasm_words:
+            for word in _ENTHUSIASM_WORDS:
                 if word in content_lower:
-                    conversation['response_patterns']['enthusiasm'] += 1
+                    response_patterns['enthusiasm'] += 1
                     break
             
-            for word in dismissal_words:
+            for word in _DISMISSAL_WORDS:
                 if word in content_lower:
-                    conversation['response_patterns']['dismissal'] += 1
+                    response_patterns['dismissal'] += 1
                     break
             
             # Question analysis
             if msg['content'].strip().endswith('?'):
                 first_word = msg['content'].strip().split()[0].lower() if msg['content'].strip().split() else ""
-                if first_word in wh_words:
+                if first_word in _WH_WORDS:
                     conversation['question_types']['wh_questions'] += 1
                 else:
                     conversation['question_types']['yes_no'] += 1
             
             # Social functions
-            for word in greeting_words:
+            for word in _GREETING_WORDS:
                 if word in content_lower:
-                    conversation['social_functions']['greetings'] += 1
+                    social_functions['greetings'] += 1
                     break
             
-            for word in farewell_words:
+            for word in _FAREWELL_WORDS:
                 if word in content_lower:
-                    conversation['social_functions']['farewells'] += 1
+                    social_functions['farewells'] += 1
                     break
             
-            for word in thanks_words:
+            for word in _THANKS_WORDS:
                 if word in content_lower:
-                    conversation['social_functions']['thanks'] += 1
+                    social_functions['thanks'] += 1
                     break
             
-            for word in apology_words:
+            for word in _APOLOGY_WORDS:
                 if word in content_lower:
-                    conversation['social_functions']['apologies'] += 1
+                    social_functions['apologies'] += 1
                     break
         
         return conversation
@@ -323,36 +367,17 @@ class DeepStyleAnalyzer:
             }
         }
         
-        # Topic keyword lists
-        gaming_terms = ["game", "play", "level", "win", "lose", "boss", "character", "server", 
-                       "raid", "guild", "pvp", "fps", "rpg", "strategy", "console", "pc",
-                       "steam", "discord", "minecraft", "fortnite", "apex", "valorant"]
-        
-        tech_terms = ["computer", "phone", "app", "website", "internet", "wifi", "software",
-                     "hardware", "code", "programming", "bug", "update", "download", "install"]
-        
-        social_terms = ["friend", "friends", "family", "school", "work", "party", "hang out",
-                       "meet", "chat", "talk", "message", "call", "text"]
-        
-        time_terms = ["today", "yesterday", "tomorrow", "now", "later", "soon", "never", 
-                     "always", "morning", "afternoon", "evening", "night", "weekend"]
-        
-        all_text = " ".join([msg['content'] for msg in self.non_empty_messages])
-        words = re.findall(r'\b\w+\b', all_text.lower())
+        topic_counter = Counter()
+        for msg in self.non_empty_messages:
+            topic_counter.update(re.findall(r'\b\w+\b', msg['content'].lower()))
         
-        # Count topic keywords
-        for word in words:
-            if word in gaming_terms:
-                topics['context_patterns']['gaming_terms'] += 1
-            elif word in tech_terms:
-                topics['context_patterns']['tech_terms'] += 1
-            elif word in social_terms:
-                topics['context_patterns']['social_terms'] += 1
-            elif word in time_terms:
-                topics['context_patterns']['time_references'] += 1
+        # Count topic keywords from the accumulated frequencies
+        context_patterns = topics['context_patterns']
+        for word, category in _TOPIC_MAP.items():
+            context_patterns[category] += topic_counter[word]
         
         # Overall word frequency for topic analysis
-        topics['topic_keywords'] = Counter(words)
+        topics['topic_keywords'] = topic_counter
         
         return topics
     
@@ -381,23 +406,12 @@ class DeepStyleAnalyzer:
             }
         }
         
-        # Emotion word lists
-        positive_words = ["good", "great", "awesome", "cool", "nice", "happy", "love", "like",
-                         "amazing", "fantastic", "wonderful", "excellent", "perfect", "fun"]
-        
-        negative_words = ["bad", "terrible", "awful", "hate", "dislike", "sad", "angry", "mad",
-                         "stupid", "dumb", "annoying", "frustrating", "boring", "sucks"]
-        
-        joy_words = ["happy", "joy", "excited", "thrilled", "delighted", "cheerful", "glad"]
-        anger_words = ["angry", "mad", "furious", "pissed", "annoyed", "irritated", "rage"]
-        sadness_words = ["sad", "depressed", "down", "upset", "disappointed", "hurt"]
-        
         for msg in self.non_empty_messages:
             content_lower = msg['content'].lower()
             
             # Basic sentiment
-            pos_count = sum(1 for word in positive_words if word in content_lower)
-            neg_count = sum(1 for word in negative_words if word in content_lower)
+            pos_count = sum(1 for word in _POSITIVE_WORDS if word in content_lower)
+            neg_count = sum(1 for word in _NEGATIVE_WORDS if word in content_lower)
             
             if pos_count > neg_count:
                 emotions['positive_indicators'] += 1
@@ -407,17 +421,17 @@ class DeepStyleAnalyzer:
                 emotions['neutral_indicators'] += 1
             
             # Specific emotions
-            for word in joy_words:
+            for word in _JOY_WORDS:
                 if word in content_lower:
                     emotions['specific_emotions']['joy'] += 1
                     break
             
-            for word in anger_words:
+            for word in _ANGER_WORDS:
                 if word in content_lower:
                     emotions['specific_emotions']['anger'] += 1
                     break
             
-            for word in sadness_words:
+            for word in _SADNESS_WORDS:
                 if word in content_lower:
                     emotions['specific_emotions']['sadness'] += 1
                     break
@@ -451,7 +465,7 @@ class DeepStyleAnalyzer:
                         "lmao", "brb", "gtg", "ttyl", "imo", "tbh", "btw", "fyi"]
         
         # Analyze messages chronologically
-        sorted_messages = sorted(self.non_empty_messages, key=lambda x: x['timestamp'])
+        sorted_messages = sorted(self.non_empty_messages, key=itemgetter('timestamp'))
         
         for i, msg in enumerate(sorted_messages):
             content_lower = msg['content'].lower()
@@ -484,7 +498,7 @@ class DeepStyleAnalyzer:
     
     def generate_comprehensive_profile(self) -> Dict[str, Any]:
         """Generate the complete comprehensive style profile"""
-        print("\n🔍 Performing deep style analysis...")
+        logger.info("🔍 Performing deep style analysis...")
         
         # Load basic profile if exists
         basic_profile = {}
@@ -492,26 +506,26 @@ class DeepStyleAnalyzer:
         if Path(basic_profile_path).exists():
             with open(basic_profile_path, 'r') as f:
                 basic_profile = json.load(f)
-            print("  ✅ Loaded existing basic profile")
+            logger.info("  ✅ Loaded existing basic profile")
         
         # Deep analyses
         message_structure = self.analyze_message_structure()
-        print("  ✅ Message structure analysis")
+        logger.debug("  ✅ Message structure analysis")
         
         linguistic_patterns = self.analyze_linguistic_patterns()
-        print("  ✅ Linguistic patterns analysis")
+        logger.debug("  ✅ Linguistic patterns analysis")
         
         conversational_style = self.analyze_conversational_style()
-        print("  ✅ Conversational style analysis")
+        logger.debug("  ✅ Conversational style analysis")
         
         topic_context = self.analyze_topic_and_context()
-        print("  ✅ Topic and context analysis")
+        logger.debug("  ✅ Topic and context analysis")
         
         emotional_tone = self.analyze_emotional_tone()
-        print("  ✅ Emotional tone analysis")
+        logger.debug("  ✅ Emotional tone analysis")
         
         advanced_patterns = self.analyze_advanced_patterns()
-        print("  ✅ Advanced patterns analysis")
+        logger.debug("  ✅ Advanced patterns analysis")
         
         # Combine all analyses
         self.comprehensive_profile = {
@@ -546,8 +560,8 @@ class DeepStyleAnalyzer:
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(self.comprehensive_profile, f, indent=2, ensure_ascii=False)
         
-        print(f"\n💾 Comprehensive profile saved to: {output_file}")
-        print(f"📊 File size: {Path(output_file).stat().st_size / 1024:.2f} KB")
+        logger.info("💾 Comprehensive profile saved to: %s", output_file)
+        logger.info("📊 File size: %.2f KB", Path(output_file).stat().st_size / 1024)
         
         return output_file
     
@@ -646,23 +660,27 @@ class DeepStyleAnalyzer:
 
 def main():
     """Main function"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     # Find the most recent messages file
     data_dir = Path('data/raw')
     if not data_dir.exists():
-        print("❌ No data/raw directory found!")
+        logger.error("❌ No data/raw directory found!")
         return
         
-    message_files = list(data_dir.glob('pyqwerty_messages_*.json'))
+    with os.scandir(data_dir) as entries:
+        message_files = [entry for entry in entries
+                         if entry.name.startswith('pyqwerty_messages_') and entry.name.endswith('.json')]
     if not message_files:
-        print("❌ No message files found in data/raw/")
+        logger.error("❌ No message files found in data/raw/")
         return
         
     # Use the most recent file
-    latest_file = max(message_files, key=lambda x: x.stat().st_mtime)
-    print(f"📁 Using message file: {latest_file}")
+    latest_file = max(message_files, key=lambda entry: entry.stat().st_mtime).path
+    logger.info("📁 Using message file: %s", latest_file)
     
     # Deep analysis
-    analyzer = DeepStyleAnalyzer(str(latest_file))
+    analyzer = DeepStyleAnalyzer(latest_file)
     analyzer.load_messages()
     analyzer.generate_comprehensive_profile()
     analyzer.print_comprehensive_summary()
@@ -670,8 +688,8 @@ def main():
     # Save comprehensive profile
     profile_file = analyzer.save_comprehensive_profile()
     
-    print(f"\n🎯 Comprehensive style analysis complete!")
-    print(f"Deep profile saved: {profile_file}")
+    logger.info("🎯 Comprehensive style analysis complete!")
+    logger.info("Deep profile saved: %s", profile_file)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
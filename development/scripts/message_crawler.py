@@ -7,9 +7,10 @@ Crawls all messages from a specific user across all accessible channels.
 import asyncio
 import json
 import os
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, Optional
 
 import discord
 from dotenv import load_dotenv
@@ -17,9 +18,77 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Channels crawled at the same time within a server
+MAX_CONCURRENT_CHANNELS = 16
+
+# Shared value for empty list fields; serializes as [] like an empty list
+NO_ITEMS = ()
+
+# Newest crawled message id per channel, used to resume incremental crawls
+CHECKPOINTS_FILE = Path('data/raw/_checkpoints.json')
+
+# Text read at a time when streaming a previous export back in
+EXPORT_READ_SIZE = 1 << 20
+
+def iter_export_messages(path: Path) -> Iterator[Dict]:
+    """Yield the messages of an export one at a time without loading the whole file"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        
+        def fill() -> bool:
+            """Drop the consumed text and read more; False at the end of the file"""
+            nonlocal buffer, pos
+            chunk = f.read(EXPORT_READ_SIZE)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return bool(chunk)
+        
+        def next_char() -> str:
+            """Skip whitespace and return the next character without consuming it"""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill():
+                    raise ValueError(f"Unexpected end of {path.name}")
+        
+        # Find the start of the messages array
+        start = -1
+        while start < 0:
+            if not fill():
+                raise ValueError(f"No messages in {path.name}")
+            start = buffer.find('"messages"')
+        pos = start + len('"messages"')
+        for expected in ':[':
+            if next_char() != expected:
+                raise ValueError(f"Malformed messages array in {path.name}")
+            pos += 1
+        
+        while True:
+            char = next_char()
+            if char == ']':
+                return
+            if char == ',':
+                pos += 1
+                continue
+            try:
+                message_data, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The message runs past the buffered text
+                if not fill():
+                    raise
+                continue
+            pos = end
+            yield message_data
+
 class MessageCrawler:
-    def __init__(self, token: str, target_user_id: int):
+    def __init__(self, token: str, target_user_id: int, incremental: bool = False):
         self.target_user_id = target_user_id
+        self.incremental = incremental
         
         # Configure specific intents
         intents = discord.Intents.default()
@@ -30,7 +99,11 @@ class MessageCrawler:
         
         self.client = discord.Client(intents=intents)
         self.token = token
-        self.messages = []
+        self.output_path = None
+        self.output_file = None
+        self.date_range = None
+        self.channel_counts = Counter()
+        self.checkpoints = self.load_checkpoints()
         self.stats = {
             'total_messages': 0,
             'servers_scanned': 0,
@@ -46,11 +119,18 @@ class MessageCrawler:
         print(f'Logged in as {self.client.user}')
         print(f'Bot is in {len(self.client.guilds)} servers')
         
-        # Start crawling
-        await self.crawl_all_messages()
+        # Messages are written out as they are found
+        self.open_output()
         
-        # Save results
-        await self.save_messages()
+        try:
+            # Start crawling
+            await self.crawl_all_messages()
+            
+            # Save results
+            await self.save_messages()
+        finally:
+            # Don't leave a truncated export behind if the crawl was interrupted
+            self.discard_output()
         
         # Print stats
         self.print_stats()
@@ -74,34 +154,53 @@ class MessageCrawler:
             
             print(f"  ✅ Found user: {target_member.display_name}")
             
-            # Crawl all text channels
+            # Skip channels the bot can't read, using locally computed
+            # permissions before any history request
+            channels = []
             for channel in guild.text_channels:
-                try:
-                    if not channel.permissions_for(guild.me).read_message_history:
-                        print(f"    ❌ No permission to read {channel.name}")
-                        continue
-                    
-                    print(f"    📂 Scanning #{channel.name}...")
-                    self.stats['channels_scanned'] += 1
-                    
-                    channel_messages = await self.crawl_channel(channel, target_member)
-                    if channel_messages:
-                        print(f"      📄 Found {len(channel_messages)} messages")
-                        self.messages.extend(channel_messages)
-                    
-                except discord.Forbidden:
-                    print(f"    ❌ Access denied to #{channel.name}")
-                    self.stats['errors'] += 1
-                except Exception as e:
-                    print(f"    ❌ Error in #{channel.name}: {e}")
-                    self.stats['errors'] += 1
-    
-    async def crawl_channel(self, channel: discord.TextChannel, target_member: discord.Member) -> List[Dict]:
+                if not channel.permissions_for(guild.me).read_message_history:
+                    print(f"    ❌ No permission to read {channel.name}")
+                else:
+                    channels.append(channel)
+            
+            # Crawl text channels concurrently; discord.py paces requests per route
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHANNELS)
+            await asyncio.gather(*(
+                self.crawl_channel_bounded(semaphore, channel, target_member)
+                for channel in channels
+            ))
+    
+    async def crawl_channel_bounded(self, semaphore: asyncio.Semaphore, channel: discord.TextChannel,
+                                    target_member: discord.Member):
+        """Crawl one channel once a concurrency slot is free"""
+        async with semaphore:
+            try:
+                print(f"    📂 Scanning #{channel.name}...")
+                self.stats['channels_scanned'] += 1
+                
+                channel_message_count = await self.crawl_channel(channel, target_member)
+                if channel_message_count:
+                    print(f"      📄 Found {channel_message_count} messages in #{channel.name}")
+                
+            except discord.Forbidden:
+                print(f"    ❌ Access denied to #{channel.name}")
+                self.stats['errors'] += 1
+            except Exception as e:
+                print(f"    ❌ Error in #{channel.name}: {e}")
+                self.stats['errors'] += 1
+    
+    async def crawl_channel(self, channel: discord.TextChannel, target_member: discord.Member) -> int:
         """Crawl messages from a specific channel for the target user"""
-        messages = []
+        message_count = 0
+        last_message_id = None
+        
+        # Resume after the newest message seen by a previous crawl
+        after = None
+        if self.incremental and str(channel.id) in self.checkpoints:
+            after = discord.Object(id=self.checkpoints[str(channel.id)])
         
         try:
-            async for message in channel.history(limit=None, oldest_first=True):
+            async for message in channel.history(limit=None, after=after, oldest_first=True):
                 if message.author.id == self.target_user_id:
                     message_data = {
                         'id': message.id,
@@ -114,60 +213,165 @@ class MessageCrawler:
                         'author_id': message.author.id,
                         'author_name': message.author.display_name,
                         'reply_to': message.reference.message_id if message.reference else None,
-                        'attachments': [att.url for att in message.attachments],
+                        'attachments': [att.url for att in message.attachments] if message.attachments else NO_ITEMS,
                         'embeds': len(message.embeds),
-                        'reactions': [{'emoji': str(reaction.emoji), 'count': reaction.count} 
-                                    for reaction in message.reactions],
-                        'mentions': [user.id for user in message.mentions],
+                        'reactions': [{'emoji': str(reaction.emoji), 'count': reaction.count}
+                                      for reaction in message.reactions] if message.reactions else NO_ITEMS,
+                        'mentions': [user.id for user in message.mentions] if message.mentions else NO_ITEMS,
                         'edited': message.edited_at.isoformat() if message.edited_at else None
                     }
-                    messages.append(message_data)
-                    self.stats['total_messages'] += 1
-                
-                # Rate limiting - Discord allows 50 requests per second
-                if len(messages) % 100 == 0:
-                    await asyncio.sleep(0.1)
+                    self.write_message(message_data, message.created_at)
+                    message_count += 1
+                last_message_id = message.id
         
         except discord.HTTPException as e:
             print(f"      ❌ HTTP error: {e}")
             self.stats['errors'] += 1
         
-        return messages
+        finally:
+            # Messages already written stay in the export whatever stopped the
+            # history, so the checkpoint has to cover them too
+            if last_message_id is not None:
+                self.checkpoints[str(channel.id)] = last_message_id
+        
+        return message_count
     
-    async def save_messages(self):
-        """Save crawled messages to JSON file"""
-        if not self.messages:
-            print("\n❌ No messages found to save!")
-            return
+    def load_checkpoints(self) -> Dict[str, int]:
+        """Load the newest crawled message id per channel"""
+        if not CHECKPOINTS_FILE.exists():
+            return {}
+        
+        with open(CHECKPOINTS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def save_checkpoints(self):
+        """Save the newest crawled message id per channel"""
+        CHECKPOINTS_FILE.parent.mkdir(parents=True, exist_ok=True)
         
+        with open(CHECKPOINTS_FILE, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self.checkpoints, indent=2))
+    
+    def open_output(self):
+        """Open the output file and start the streamed messages array"""
         # Create output directory
         output_dir = Path('data/raw')
         output_dir.mkdir(parents=True, exist_ok=True)
         
+        # An incremental crawl extends the newest export, which its checkpoints describe
+        previous_export = self.find_previous_export(output_dir) if self.incremental else None
+        if self.incremental and previous_export is None:
+            print("⚠️  No previous export to extend, crawling everything")
+            self.incremental = False
+        elif self.incremental and not self.checkpoints:
+            # Exports from before checkpoints existed would be crawled again in full
+            print("⚠️  No checkpoints from a previous crawl, crawling everything")
+            self.incremental = False
+            previous_export = None
+        
         # Generate filename with timestamp
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'pyqwerty_messages_{timestamp}.json'
-        filepath = output_dir / filename
-        
-        # Prepare data for saving
-        output_data = {
-            'metadata': {
-                'target_user_id': self.target_user_id,
-                'crawl_timestamp': datetime.now().isoformat(),
-                'total_messages': len(self.messages),
-                'date_range': {
-                    'earliest': min(msg['timestamp'] for msg in self.messages),
-                    'latest': max(msg['timestamp'] for msg in self.messages)
-                } if self.messages else None,
-                'stats': self.stats
+        self.output_path = output_dir / f'pyqwerty_messages_{timestamp}.json'
+        
+        # Stream to a .partial name the analyzers ignore until the export is complete
+        self.output_file = open(self.partial_path, 'w', encoding='utf-8', buffering=1 << 20)
+        self.output_file.write('{"messages":[')
+        
+        if previous_export is not None:
+            self.carry_over(previous_export)
+    
+    def find_previous_export(self, output_dir: Path) -> Optional[Path]:
+        """Newest complete message export, if any"""
+        with os.scandir(output_dir) as entries:
+            exports = [entry for entry in entries
+                       if entry.name.startswith('pyqwerty_messages_') and entry.name.endswith('.json')]
+        if not exports:
+            return None
+        return Path(max(exports, key=lambda entry: entry.stat().st_mtime).path)
+    
+    def carry_over(self, previous_export: Path):
+        """Copy the messages of the previous export that this crawl won't fetch again"""
+        # Channels are only resumed after their checkpoint; anything else is crawled again
+        carried = 0
+        for message_data in iter_export_messages(previous_export):
+            checkpoint = self.checkpoints.get(str(message_data['channel_id']))
+            if checkpoint is None or message_data['id'] > checkpoint:
+                continue
+            self.write_message(message_data, datetime.fromisoformat(message_data['timestamp']))
+            carried += 1
+        
+        print(f"📥 Carried over {carried} messages from {previous_export.name}")
+    
+    @property
+    def partial_path(self) -> Path:
+        """Where the export is written until the crawl finishes"""
+        return self.output_path.with_name(self.output_path.name + '.partial')
+    
+    def discard_output(self):
+        """Close and delete an export that was not saved"""
+        if self.output_path is None:
+            return
+        if self.output_file is not None:
+            self.output_file.close()
+            self.output_file = None
+        self.partial_path.unlink(missing_ok=True)
+    
+    def write_message(self, message_data: Dict, created_at: datetime):
+        """Append one message to the output file and update running stats"""
+        if self.stats['total_messages']:
+            self.output_file.write(',')
+        self.output_file.write(json.dumps(message_data, ensure_ascii=False, separators=(',', ':')))
+        self.stats['total_messages'] += 1
+        
+        # Track the date range on datetimes; only the endpoints get formatted
+        if self.date_range is None:
+            self.date_range = [created_at, created_at]
+        elif created_at < self.date_range[0]:
+            self.date_range[0] = created_at
+        elif created_at > self.date_range[1]:
+            self.date_range[1] = created_at
+        
+        channel_key = f"{message_data['guild_name']}#{message_data['channel_name']}"
+        self.channel_counts[channel_key] += 1
+    
+    async def save_messages(self):
+        """Finish the messages file with the crawl metadata"""
+        if not self.stats['total_messages']:
+            self.discard_output()
+            print("\n❌ No messages found to save!")
+            return
+        
+        metadata = {
+            'target_user_id': self.target_user_id,
+            'crawl_timestamp': datetime.now().isoformat(),
+            'incremental': self.incremental,
+            'total_messages': self.stats['total_messages'],
+            'date_range': {
+                'earliest': self.date_range[0].isoformat(),
+                'latest': self.date_range[1].isoformat()
             },
-            'messages': sorted(self.messages, key=lambda x: x['timestamp'])
+            'stats': self.stats
         }
         
-        # Save to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        # Close the compact messages array; only the metadata is indented
+        self.output_file.write('],"metadata":')
+        json.dump(metadata, self.output_file, indent=2, ensure_ascii=False)
+        self.output_file.write('}')
         
+        # The export is only read back later by the analyzers, so drop it
+        # from the page cache instead of evicting more useful pages. Dirty
+        # pages can't be dropped, so write them out first
+        self.output_file.flush()
+        if hasattr(os, 'posix_fadvise'):
+            os.fsync(self.output_file.fileno())
+            os.posix_fadvise(self.output_file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        self.output_file.close()
+        self.output_file = None
+        os.replace(self.partial_path, self.output_path)
+        
+        # Only move the checkpoints once the messages they cover are in an export
+        self.save_checkpoints()
+        
+        filepath = self.output_path
         print(f"\n💾 Messages saved to: {filepath}")
         print(f"📊 File size: {filepath.stat().st_size / 1024 / 1024:.2f} MB")
     
@@ -181,15 +385,10 @@ class MessageCrawler:
         print(f"Channels scanned: {self.stats['channels_scanned']}")
         print(f"Errors encountered: {self.stats['errors']}")
         
-        if self.messages:
+        if self.channel_counts:
             # Channel breakdown
-            channel_counts = {}
-            for msg in self.messages:
-                channel_key = f"{msg['guild_name']}#{msg['channel_name']}"
-                channel_counts[channel_key] = channel_counts.get(channel_key, 0) + 1
-            
             print(f"\n📊 Messages per channel:")
-            for channel, count in sorted(channel_counts.items(), key=lambda x: x[1], reverse=True)[:10]:
+            for channel, count in self.channel_counts.most_common(10):
                 print(f"  {channel}: {count}")
     
     async def run(self):
@@ -209,6 +408,7 @@ async def main():
     # Get configuration
     bot_token = os.getenv('DISCORD_BOT_TOKEN')
     target_user_id = int(os.getenv('TARGET_USER_ID', '707614458826194955'))
+    incremental = os.getenv('CRAWL_INCREMENTAL', '').lower() in ('1', 'true', 'yes')
     
     if not bot_token:
         print("❌ Error: DISCORD_BOT_TOKEN not found!")
@@ -218,10 +418,12 @@ async def main():
     
     print("🤖 Discord Message Crawler")
     print(f"Target User ID: {target_user_id}")
+    if incremental:
+        print("Incremental crawl: only messages newer than the last checkpoints")
     print("Starting crawler...\n")
     
     # Create and run crawler
-    crawler = MessageCrawler(bot_token, target_user_id)
+    crawler = MessageCrawler(bot_token, target_user_id, incremental=incremental)
     await crawler.run()
 
 if __name__ == '__main__':
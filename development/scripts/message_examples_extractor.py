@@ -5,209 +5,265 @@ Extracts specific examples and creates detailed style documentation.
 """
 
 import json
+import os
 import re
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 import random
 from datetime import datetime
 
+def _keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """Compile keywords into one regex matching any of them as whole words"""
+    return re.compile(r'\b(?:' + '|'.join(map(re.escape, keywords)) + r')\b')
+
+_AGREEMENT_RE = _keyword_pattern(['yes', 'yeah', 'yep', 'true', 'right', 'exactly', 'definitely'])
+_DISAGREEMENT_RE = _keyword_pattern(['no', 'nah', 'nope', 'wrong', 'false', 'disagree'])
+_ACKNOWLEDGMENT_RE = _keyword_pattern(['ok', 'alright', 'cool', 'nice', 'got it', 'fair'])
+
+_SLANG_RE = _keyword_pattern(['lol', 'lmao', 'bruh', 'fr', 'nah', 'yah', 'ok', 'wtf', 'tbh', 'imo', 'bro', 'dude'])
+_CONTRACTION_RE = _keyword_pattern([
+    "don't", "can't", "won't", "isn't", "aren't", "wasn't", "weren't",
+    "haven't", "hasn't", "hadn't", "wouldn't", "couldn't", "shouldn't",
+    "i'm", "you're", "he's", "she's", "it's", "we're", "they're",
+    "i've", "you've", "we've", "they've", "i'll", "you'll", "he'll",
+    "she'll", "it'll", "we'll", "they'll", "i'd", "you'd", "he'd",
+    "she'd", "it'd", "we'd", "they'd", "im", "ur", "u"
+])
+
+# Topic keywords are single words, matched against each message's tokens
+_GAMING_WORDS = frozenset({'game', 'play', 'server', 'minecraft', 'discord', 'stream', 'video'})
+_PERSONAL_WORDS = frozenset({'i', 'my', 'me', 'myself', 'mine'})
+_REACTION_WORDS = frozenset({'lol', 'lmao', 'haha', 'omg', 'wtf', 'damn', 'shit', 'fuck'})
+
+# Whole-message responses and clarification question words
+_AFFIRMATIVE_RESPONSES = frozenset({'yes', 'yeah', 'yep', 'true', 'right', 'ok', 'alright', 'sure'})
+_NEGATIVE_RESPONSES = frozenset({'no', 'nah', 'nope', 'wrong', 'false'})
+_QUESTION_WORDS = frozenset({'what', 'how', 'why', 'when', 'where'})
+
+# Punctuation stripped from token edges before matching words
+_TOKEN_PUNCTUATION = '.,!?;:"()'
+
+def _reservoir_add(rng: random.Random, reservoir: List[str], item: str, size: int, seen: int):
+    """Add the (seen + 1)-th item to a uniform random sample of at most size items"""
+    if seen < size:
+        reservoir.append(item)
+    else:
+        index = rng.randrange(seen + 1)
+        if index < size:
+            reservoir[index] = item
+
+# Length category indexed by word count; 21+ words share the last entry
+_LENGTH_CATEGORIES = (
+    (None, 'one_word')
+    + ('two_three_words',) * 2
+    + ('short_responses',) * 7
+    + ('medium_messages',) * 10
+    + ('long_messages',)
+)
+_LONG_MESSAGE_WORDS = len(_LENGTH_CATEGORIES) - 1
+
+# Random examples kept per category
+_SAMPLE_SIZES = {
+    'one_word': 20,
+    'two_three_words': 20,
+    'short_responses': 30,  # 4-10 words
+    'medium_messages': 20,  # 11-20 words
+    'long_messages': 15,    # 20+ words
+    'agreements': 15,
+    'disagreements': 15,
+    'questions': 15,
+    'casual_acknowledgments': 15,
+    'lowercase_starts': 20,
+    'all_lowercase': 20,
+    'with_slang': 20,
+    'with_contractions': 20,
+    'replies_to_others': 25,
+    'conversation_starters': 20,
+    'gaming_messages': 15,
+    'personal_messages': 20,
+    'reaction_messages': 15
+}
+
+# Categories that keep their first matches in message order
+_FIRST_MATCH_SIZES = {
+    'explanatory': 15,  # Messages that explain something
+    'affirmative': 15,  # Simple yes/agreement responses
+    'negative': 15,     # No/disagreement responses
+    'questioning': 15   # When he asks for clarification
+}
+
+# Message fields the categorization reads, as (content, reply_to) rows
+_CATEGORIZED_FIELDS = itemgetter('content', 'reply_to')
+
+# Categorizing costs ~14us per message; starting a two-worker pool costs ~10ms
+# with fork but ~270ms with spawn (macOS/Windows), so spawn only breaks even
+# around 40k messages
+_MIN_PARALLEL_MESSAGES = 40000
+
+# Shards per large export; fixed so the seeded sample doesn't depend on the core count
+_SHARD_COUNT = 8
+
+def _categorize_messages(rows: Iterable[Tuple[str, Optional[int]]],
+                         rng: random.Random) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+    """Sample every example category in a single pass over (content, reply_to) rows
+
+    Also returns how many messages matched each sampled category, which
+    is what merging samples taken from separate shards needs.
+    """
+    examples = {category: [] for category in (*_SAMPLE_SIZES, *_FIRST_MATCH_SIZES)}
+    seen = dict.fromkeys(_SAMPLE_SIZES, 0)
+    
+    def sample(category: str, content: str):
+        _reservoir_add(rng, examples[category], content, _SAMPLE_SIZES[category], seen[category])
+        seen[category] += 1
+    
+    def keep_first(category: str, content: str):
+        if len(examples[category]) < _FIRST_MATCH_SIZES[category]:
+            examples[category].append(content)
+    
+    for content, reply_to in rows:
+        content = content.strip()
+        content_lower = content.lower()
+        tokens = content_lower.split()
+        word_count = len(tokens)
+        word_set = {token.strip(_TOKEN_PUNCTUATION) for token in tokens}
+        
+        # By length
+        sample(_LENGTH_CATEGORIES[min(word_count, _LONG_MESSAGE_WORDS)], content)
+        
+        # By conversational function
+        if _AGREEMENT_RE.search(content_lower):
+            sample('agreements', content)
+        
+        if _DISAGREEMENT_RE.search(content_lower):
+            sample('disagreements', content)
+        
+        if content_lower.endswith('?'):
+            sample('questions', content)
+        
+        if _ACKNOWLEDGMENT_RE.search(content_lower):
+            sample('casual_acknowledgments', content)
+        
+        # By style patterns
+        if content[0].islower():
+            sample('lowercase_starts', content)
+        
+        if content.islower() and len(content) > 3:
+            sample('all_lowercase', content)
+        
+        if _SLANG_RE.search(content_lower):
+            sample('with_slang', content)
+        
+        if _CONTRACTION_RE.search(content_lower):
+            sample('with_contractions', content)
+        
+        # Context: replies vs standalone messages
+        if reply_to:
+            sample('replies_to_others', content)
+        elif word_count > 2:  # Not just "ok" or "lol"
+            sample('conversation_starters', content)
+        
+        # Topic specific
+        if not word_set.isdisjoint(_GAMING_WORDS):
+            sample('gaming_messages', content)
+        
+        if not word_set.isdisjoint(_PERSONAL_WORDS):
+            sample('personal_messages', content)
+        
+        if not word_set.isdisjoint(_REACTION_WORDS):
+            sample('reaction_messages', content)
+        
+        # Response patterns
+        # Explanatory (longer messages with "because", "since", "so")
+        if any(word in content_lower for word in ['because', 'since', 'so that', 'the reason']):
+            keep_first('explanatory', content)
+        
+        # Simple affirmative
+        if content_lower in _AFFIRMATIVE_RESPONSES:
+            keep_first('affirmative', content)
+        
+        # Simple negative
+        if content_lower in _NEGATIVE_RESPONSES:
+            keep_first('negative', content)
+        
+        # Questioning/clarification
+        if '?' in content and not word_set.isdisjoint(_QUESTION_WORDS):
+            keep_first('questioning', content)
+    
+    return examples, seen
+
+def _categorize_shard(rows: List[Tuple[str, Optional[int]]], seed: int) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+    """Worker entry point: categorize one shard with its own seeded RNG"""
+    return _categorize_messages(rows, random.Random(seed))
+
+def _merge_samples(rng: random.Random, first: List[str], first_seen: int,
+                   second: List[str], second_seen: int, size: int) -> List[str]:
+    """Merge uniform samples of two streams into a uniform sample of both
+
+    The number of items drawn from each side follows the hypergeometric
+    split of size picks from first_seen + second_seen matches.
+    """
+    total = first_seen + second_seen
+    picks = min(size, total)
+    from_first = 0
+    for remaining in range(total, total - picks, -1):
+        if rng.randrange(remaining) < first_seen - from_first:
+            from_first += 1
+    return rng.sample(first, from_first) + rng.sample(second, picks - from_first)
+
 class MessageExamplesExtractor:
-    def __init__(self, messages_file: str):
+    def __init__(self, messages_file: str, seed: Optional[int] = 0xC0FFEE, workers: int = 1):
         self.messages_file = messages_file
+        self.workers = workers
         self.messages = []
         self.examples = defaultdict(list)
+        # Fixed seed by default so repeated runs pick the same examples
+        self._rng = random.Random(seed)
         
     def load_messages(self):
         """Load messages"""
-        with open(self.messages_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            self.messages = [msg for msg in data['messages'] if msg['content'].strip()]
+        with open(self.messages_file, 'rb') as f:
+            data = json.loads(f.read())
+        # The crawler writes channels as they are crawled; first-match examples want time order
+        messages = sorted(data['messages'], key=itemgetter('timestamp'))
+        self.messages = [msg for msg in messages if msg['content'].strip()]
         print(f"✅ Loaded {len(self.messages)} non-empty messages")
         
-    def extract_by_length(self):
-        """Extract examples by message length"""
-        one_word = []
-        two_three_words = []
-        short_responses = []  # 4-10 words
-        medium_messages = []  # 11-20 words
-        long_messages = []    # 20+ words
-        
-        for msg in self.messages:
-            content = msg['content'].strip()
-            words = content.split()
-            word_count = len(words)
-            
-            if word_count == 1:
-                one_word.append(content)
-            elif word_count in [2, 3]:
-                two_three_words.append(content)
-            elif 4 <= word_count <= 10:
-                short_responses.append(content)
-            elif 11 <= word_count <= 20:
-                medium_messages.append(content)
-            elif word_count > 20:
-                long_messages.append(content)
-        
-        self.examples['one_word'] = random.sample(one_word, min(20, len(one_word)))
-        self.examples['two_three_words'] = random.sample(two_three_words, min(20, len(two_three_words)))
-        self.examples['short_responses'] = random.sample(short_responses, min(30, len(short_responses)))
-        self.examples['medium_messages'] = random.sample(medium_messages, min(20, len(medium_messages)))
-        self.examples['long_messages'] = random.sample(long_messages, min(15, len(long_messages)))
-        
-    def extract_by_conversation_function(self):
-        """Extract by conversational function"""
-        agreements = []
-        disagreements = []
-        questions = []
-        responses_to_questions = []
-        topic_starters = []
-        casual_acknowledgments = []
-        
-        # Pattern matching
-        for i, msg in enumerate(self.messages):
-            content = msg['content'].strip().lower()
-            
-            # Agreements
-            if any(word in content for word in ['yes', 'yeah', 'yep', 'true', 'right', 'exactly', 'definitely']):
-                agreements.append(msg['content'].strip())
-            
-            # Disagreements  
-            if any(word in content for word in ['no', 'nah', 'nope', 'wrong', 'false', 'disagree']):
-                disagreements.append(msg['content'].strip())
-            
-            # Questions
-            if content.endswith('?'):
-                questions.append(msg['content'].strip())
-            
-            # Casual acknowledgments
-            if any(word in content for word in ['ok', 'alright', 'cool', 'nice', 'got it', 'fair']):
-                casual_acknowledgments.append(msg['content'].strip())
-        
-        self.examples['agreements'] = random.sample(agreements, min(15, len(agreements)))
-        self.examples['disagreements'] = random.sample(disagreements, min(15, len(disagreements)))
-        self.examples['questions'] = random.sample(questions, min(15, len(questions)))
-        self.examples['casual_acknowledgments'] = random.sample(casual_acknowledgments, min(15, len(casual_acknowledgments)))
-        
-    def extract_by_style_patterns(self):
-        """Extract by specific style patterns"""
-        lowercase_starts = []
-        all_lowercase = []
-        with_slang = []
-        with_contractions = []
-        with_typos = []
-        rapid_fire = []
-        
-        slang_words = ['lol', 'lmao', 'bruh', 'fr', 'nah', 'yah', 'ok', 'wtf', 'tbh', 'imo', 'bro', 'dude']
-        contractions = ["don't", "can't", "won't", "isn't", "aren't", "wasn't", "weren't", 
-                       "haven't", "hasn't", "hadn't", "wouldn't", "couldn't", "shouldn't",
-                       "i'm", "you're", "he's", "she's", "it's", "we're", "they're",
-                       "i've", "you've", "we've", "they've", "i'll", "you'll", "he'll",
-                       "she'll", "it'll", "we'll", "they'll", "i'd", "you'd", "he'd",
-                       "she'd", "it'd", "we'd", "they'd", "im", "ur", "u"]
-        
-        for msg in self.messages:
-            content = msg['content'].strip()
-            content_lower = content.lower()
-            
-            # Lowercase starts
-            if content and content[0].islower():
-                lowercase_starts.append(content)
-            
-            # All lowercase
-            if content.islower() and len(content) > 3:
-                all_lowercase.append(content)
-            
-            # With slang
-            if any(slang in content_lower for slang in slang_words):
-                with_slang.append(content)
-            
-            # With contractions
-            if any(contraction in content_lower for contraction in contractions):
-                with_contractions.append(content)
-        
-        self.examples['lowercase_starts'] = random.sample(lowercase_starts, min(20, len(lowercase_starts)))
-        self.examples['all_lowercase'] = random.sample(all_lowercase, min(20, len(all_lowercase)))
-        self.examples['with_slang'] = random.sample(with_slang, min(20, len(with_slang)))
-        self.examples['with_contractions'] = random.sample(with_contractions, min(20, len(with_contractions)))
-        
-    def extract_context_responses(self):
-        """Extract responses that show how Py responds in different contexts"""
-        # Look for replies to understand response patterns
-        replies_to_others = []
-        conversation_starters = []
-        
-        for msg in self.messages:
-            if msg['reply_to']:
-                replies_to_others.append(msg['content'].strip())
-            else:
-                # Likely conversation starter or standalone comment
-                if len(msg['content'].split()) > 2:  # Not just "ok" or "lol"
-                    conversation_starters.append(msg['content'].strip())
-        
-        self.examples['replies_to_others'] = random.sample(replies_to_others, min(25, len(replies_to_others)))
-        self.examples['conversation_starters'] = random.sample(conversation_starters, min(20, len(conversation_starters)))
-        
-    def extract_topic_specific(self):
-        """Extract messages about specific topics"""
-        gaming_messages = []
-        personal_messages = []
-        reaction_messages = []
-        
-        gaming_keywords = ['game', 'play', 'server', 'minecraft', 'discord', 'stream', 'video']
-        personal_keywords = ['i', 'my', 'me', 'myself', 'mine']
-        reaction_keywords = ['lol', 'lmao', 'haha', 'omg', 'wtf', 'damn', 'shit', 'fuck']
-        
-        for msg in self.messages:
-            content_lower = msg['content'].lower()
-            
-            if any(keyword in content_lower for keyword in gaming_keywords):
-                gaming_messages.append(msg['content'].strip())
-            
-            if any(keyword in content_lower for keyword in personal_keywords):
-                personal_messages.append(msg['content'].strip())
-                
-            if any(keyword in content_lower for keyword in reaction_keywords):
-                reaction_messages.append(msg['content'].strip())
-        
-        self.examples['gaming_messages'] = random.sample(gaming_messages, min(15, len(gaming_messages)))
-        self.examples['personal_messages'] = random.sample(personal_messages, min(20, len(personal_messages)))
-        self.examples['reaction_messages'] = random.sample(reaction_messages, min(15, len(reaction_messages)))
-        
-    def analyze_response_patterns(self):
-        """Analyze how Py responds to different types of messages"""
-        # This would require analyzing the context of what he's responding to
-        # For now, let's categorize his standalone messages
-        
-        explanatory = []  # Messages that explain something
-        affirmative = []  # Simple yes/agreement responses  
-        negative = []     # No/disagreement responses
-        questioning = []  # When he asks for clarification
-        
-        for msg in self.messages:
-            content = msg['content'].strip()
-            content_lower = content.lower()
-            
-            # Explanatory (longer messages with "because", "since", "so")
-            if any(word in content_lower for word in ['because', 'since', 'so that', 'the reason']):
-                explanatory.append(content)
-            
-            # Simple affirmative
-            if content_lower in ['yes', 'yeah', 'yep', 'true', 'right', 'ok', 'alright', 'sure']:
-                affirmative.append(content)
-            
-            # Simple negative
-            if content_lower in ['no', 'nah', 'nope', 'wrong', 'false']:
-                negative.append(content)
-            
-            # Questioning/clarification
-            if any(word in content_lower for word in ['what', 'how', 'why', 'when', 'where']) and '?' in content:
-                questioning.append(content)
-        
-        self.examples['explanatory'] = explanatory[:15]
-        self.examples['affirmative'] = affirmative[:15] 
-        self.examples['negative'] = negative[:15]
-        self.examples['questioning'] = questioning[:15]
+    def _categorize(self) -> Dict[str, List[str]]:
+        """Categorize the messages, in fixed shards spread over the workers for large exports"""
+        if len(self.messages) < _MIN_PARALLEL_MESSAGES:
+            examples, _ = _categorize_messages(map(_CATEGORIZED_FIELDS, self.messages), self._rng)
+            return examples
+        
+        # Large exports are always sharded the same way; workers only decide
+        # how many shards run at once. Workers only get the fields they read,
+        # which keeps pickling cheap
+        rows = list(map(_CATEGORIZED_FIELDS, self.messages))
+        shard_size = -(-len(rows) // _SHARD_COUNT)
+        shards = [rows[i:i + shard_size] for i in range(0, len(rows), shard_size)]
+        seeds = [self._rng.getrandbits(64) for _ in shards]
+        if self.workers <= 1:
+            results = list(map(_categorize_shard, shards, seeds))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(shards))) as executor:
+                results = list(executor.map(_categorize_shard, shards, seeds))
+        
+        # Shards come back in message order, so first matches stay first
+        examples, seen = results[0]
+        for shard_examples, shard_seen in results[1:]:
+            for category, size in _SAMPLE_SIZES.items():
+                examples[category] = _merge_samples(
+                    self._rng, examples[category], seen[category],
+                    shard_examples[category], shard_seen[category], size
+                )
+                seen[category] += shard_seen[category]
+            for category, size in _FIRST_MATCH_SIZES.items():
+                examples[category] = (examples[category] + shard_examples[category])[:size]
+        
+        return examples
         
     def generate_style_guide(self):
         """Generate a comprehensive style guide"""
@@ -246,23 +302,8 @@ class MessageExamplesExtractor:
         """Extract all example categories"""
         print("🔍 Extracting message examples by category...")
         
-        self.extract_by_length()
-        print("  ✅ Length-based examples")
-        
-        self.extract_by_conversation_function()
-        print("  ✅ Conversational function examples")
-        
-        self.extract_by_style_patterns()
-        print("  ✅ Style pattern examples")
-        
-        self.extract_context_responses()
-        print("  ✅ Context response examples")
-        
-        self.extract_topic_specific()
-        print("  ✅ Topic-specific examples")
-        
-        self.analyze_response_patterns()
-        print("  ✅ Response pattern examples")
+        self.examples.update(self._categorize())
+        print("  ✅ Sampled examples for every category")
         
     def save_style_guide(self, output_file: str = None):
         """Save comprehensive style guide"""
@@ -271,11 +312,19 @@ class MessageExamplesExtractor:
             output_file = f'data/processed/pyqwerty_style_guide_{timestamp}.json'
         
         style_guide = self.generate_style_guide()
+        examples = style_guide.pop('examples_by_category')
+        header = json.dumps(style_guide, indent=2, ensure_ascii=False)
         
         Path(output_file).parent.mkdir(parents=True, exist_ok=True)
         
+        # Indented header, then one compact line per example category
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(style_guide, f, indent=2, ensure_ascii=False)
+            f.write(header[:-len('\n}')])
+            f.write(',\n  "examples_by_category": {')
+            for i, (category, items) in enumerate(examples.items()):
+                f.write(',\n    ' if i else '\n    ')
+                f.write(json.dumps(category) + ': ' + json.dumps(items, ensure_ascii=False))
+            f.write('\n  }\n}')
         
         print(f"\n💾 Style guide saved to: {output_file}")
         return output_file
@@ -299,12 +348,22 @@ def main():
     
     # Find the most recent messages file
     data_dir = Path('data/raw')
-    message_files = list(data_dir.glob('pyqwerty_messages_*.json'))
-    latest_file = max(message_files, key=lambda x: x.stat().st_mtime)
+    if not data_dir.exists():
+        print("❌ No data/raw directory found!")
+        return
+        
+    with os.scandir(data_dir) as entries:
+        message_files = [entry for entry in entries
+                         if entry.name.startswith('pyqwerty_messages_') and entry.name.endswith('.json')]
+    if not message_files:
+        print("❌ No message files found in data/raw/")
+        return
+        
+    latest_file = max(message_files, key=lambda entry: entry.stat().st_mtime).path
     
     print(f"📁 Using message file: {latest_file}")
     
-    extractor = MessageExamplesExtractor(str(latest_file))
+    extractor = MessageExamplesExtractor(latest_file, workers=os.cpu_count() or 1)
     extractor.load_messages()
     extractor.extract_all_examples()
     extractor.print_examples_summary()
@@ -4,320 +4,431 @@ Style Analyzer for Pyqwerty Bot
 Analyzes Discord messages to extract writing style patterns.
 """
 
+import calendar
 import json
+import os
 import re
+import sys
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from heapq import nsmallest
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any
-import statistics
+from typing import Dict, Iterable, List, Any, Tuple
+
+# One match per emoji codepoint, so runs like "😂😂" count as two
+_EMOJI_RE = re.compile(r'[\U0001F600-\U0001F64F'  # emoticons
+                       r'\U0001F300-\U0001F5FF'   # symbols & pictographs
+                       r'\U0001F680-\U0001F6FF'   # transport & map
+                       r'\U0001F1E0-\U0001F1FF'   # flags
+                       r'\U00002600-\U000026FF'   # miscellaneous
+                       r'\U00002700-\U000027BF]') # dingbats
+
+_WORD_RE = re.compile(r'\b\w+\b')
+_REPEATED_PUNCTUATION_RE = re.compile(r'[!?]{2,}')
+_PUNCTUATION_RE = re.compile('[' + re.escape('.,!?;:-()[]{}"\'/\\') + ']')
+
+_CASUAL_RE = re.compile(r'\b(?:ok|yeah|lol|lmao|bruh|nice|cool|true|fr|nah)\b')
+
+# Message fields read by the scan, fetched in one call per message
+_MESSAGE_FIELDS = itemgetter('timestamp', 'reply_to', 'mentions', 'reactions', 'attachments', 'embeds')
+
+# Example messages kept per category
+_EXAMPLES_PER_CATEGORY = 10
+
+# Scanning takes ~11.5us per message, shipping a chunk ~1.5us per message, and
+# every extra chunk's counters ~18ms to return and merge; with spawn's ~270ms
+# pool startup two workers only pay off from roughly 70k messages
+_MIN_PARALLEL_MESSAGES = 70000
+
+def _empty_examples() -> Dict[str, List[str]]:
+    return {
+        'short_messages': [],
+        'medium_messages': [],
+        'long_messages': [],
+        'questions': [],
+        'exclamations': [],
+        'casual_responses': [],
+        'with_emojis': []
+    }
+
+def _percent_of(total: int) -> float:
+    """Factor turning a count into a percentage of total (0 when total is 0)"""
+    return 100.0 / total if total else 0.0
+
+def _median(sorted_values: List[int]) -> float:
+    """Median of an already sorted list (0 when empty)"""
+    if not sorted_values:
+        return 0
+    middle = len(sorted_values) // 2
+    if len(sorted_values) % 2:
+        return sorted_values[middle]
+    return (sorted_values[middle - 1] + sorted_values[middle]) / 2
+
+def _join_phrases(counts: List[tuple]) -> List[tuple]:
+    """Turn (word tuple, count) pairs into ("word word", count) pairs"""
+    return [(' '.join(words), count) for words, count in counts]
+
+@dataclass
+class _MessageScan:
+    """Accumulators filled by one pass over the messages"""
+    # Basic stats (non-empty messages only)
+    message_lengths: List[int] = field(default_factory=list)
+    word_counts: List[int] = field(default_factory=list)
+    # Vocabulary
+    word_freq: Counter = field(default_factory=Counter)
+    total_words: int = 0
+    # Phrases are counted as word tuples and only joined for the top entries
+    phrase_freq_2: Counter = field(default_factory=Counter)
+    phrase_freq_3: Counter = field(default_factory=Counter)
+    # Punctuation and style
+    punctuation_counts: Counter = field(default_factory=Counter)
+    style_patterns: Dict[str, int] = field(default_factory=dict)
+    # Emojis
+    emoji_freq: Counter = field(default_factory=Counter)
+    messages_with_emojis: int = 0
+    # Timing (every message)
+    hour_counts: List[int] = field(default_factory=lambda: [0] * 24)
+    day_counts: List[int] = field(default_factory=lambda: [0] * 7)  # Monday first
+    # Interactions (every message)
+    reply_count: int = 0
+    mention_count: int = 0
+    reaction_count: int = 0
+    attachment_count: int = 0
+    embed_count: int = 0
+    mention_freq: Counter = field(default_factory=Counter)
+    # First examples per category
+    examples: Dict[str, List[str]] = field(default_factory=_empty_examples)
+    
+    def merge(self, other: '_MessageScan'):
+        """Add the statistics of a later run of messages to this one"""
+        self.message_lengths.extend(other.message_lengths)
+        self.word_counts.extend(other.word_counts)
+        self.word_freq += other.word_freq
+        self.total_words += other.total_words
+        self.phrase_freq_2 += other.phrase_freq_2
+        self.phrase_freq_3 += other.phrase_freq_3
+        self.punctuation_counts += other.punctuation_counts
+        for key, value in other.style_patterns.items():
+            self.style_patterns[key] += value
+        self.emoji_freq += other.emoji_freq
+        self.messages_with_emojis += other.messages_with_emojis
+        self.hour_counts = [a + b for a, b in zip(self.hour_counts, other.hour_counts)]
+        self.day_counts = [a + b for a, b in zip(self.day_counts, other.day_counts)]
+        self.reply_count += other.reply_count
+        self.mention_count += other.mention_count
+        self.reaction_count += other.reaction_count
+        self.attachment_count += other.attachment_count
+        self.embed_count += other.embed_count
+        self.mention_freq += other.mention_freq
+        for category, messages in other.examples.items():
+            self.examples[category] = (self.examples[category] + messages)[:_EXAMPLES_PER_CATEGORY]
+
+def _scan_chunk(rows: Iterable[Tuple], contents: List[str], lowers: List[str]) -> _MessageScan:
+    """Collect every per-message statistic for a run of _MESSAGE_FIELDS rows in a single pass"""
+    scan = _MessageScan()
+    examples = scan.examples
+    open_categories = len(examples)
+    weekdays = {}  # Weekday index per calendar date
+    # Interaction and style pattern tallies stay in locals during the loop
+    mention_freq = scan.mention_freq
+    reply_count = mention_count = reaction_count = attachment_count = embed_count = 0
+    all_caps = questions = exclamations = ellipses = 0
+    repeated_punctuation = lowercase_starts = unterminated = 0
+    
+    for row, content, content_lower in zip(rows, contents, lowers):
+        # Timing and interactions count every message, even empty ones
+        # ISO 8601 timestamps: the hour is at [11:13], the date at [:10]
+        timestamp, reply_to, mentions, reactions, attachments, embeds = row
+        scan.hour_counts[int(timestamp[11:13])] += 1
+        date = timestamp[:10]
+        weekday = weekdays.get(date)
+        if weekday is None:
+            weekday = weekdays[date] = datetime.fromisoformat(date).weekday()
+        scan.day_counts[weekday] += 1
+        
+        if reply_to:
+            reply_count += 1
+        
+        if mentions:
+            mention_count += 1
+            mention_freq.update(mentions)
+        
+        reaction_count += len(reactions)
+        attachment_count += len(attachments)
+        embed_count += embeds
+        
+        if not content:  # Skip empty messages
+            continue
+        word_count = len(content.split())
+        
+        # Basic stats
+        scan.message_lengths.append(len(content))
+        scan.word_counts.append(word_count)
+        
+        # Vocabulary and common phrases (2-3 word combinations)
+        # Interned so every phrase tuple shares one string per distinct word
+        words = list(map(sys.intern, _WORD_RE.findall(content_lower)))
+        scan.word_freq.update(words)
+        scan.total_words += len(words)
+        
+        scan.phrase_freq_2.update(zip(words, words[1:]))
+        scan.phrase_freq_3.update(zip(words, words[1:], words[2:]))
+        
+        # Count punctuation
+        punctuation = _PUNCTUATION_RE.findall(content)
+        if punctuation:
+            scan.punctuation_counts.update(punctuation)
+        
+        # Style patterns
+        last_char = content[-1]
+        if content.isupper() and len(content) > 3:
+            all_caps += 1
+        
+        if last_char == '?':
+            questions += 1
+            
+        if last_char == '!':
+            exclamations += 1
+            
+        if '...' in content:
+            ellipses += 1
+            
+        # Repeated punctuation (!!!, ???, etc.)
+        if _REPEATED_PUNCTUATION_RE.search(content):
+            repeated_punctuation += 1
+            
+        # Starts with lowercase
+        if content[0].islower():
+            lowercase_starts += 1
+            
+        # No ending punctuation
+        if last_char not in '.!?':
+            unterminated += 1
+        
+        # Emojis
+        emojis = _EMOJI_RE.findall(content)
+        if emojis:
+            scan.messages_with_emojis += 1
+            scan.emoji_freq.update(emojis)
+        
+        # Example messages, until every category has its first few
+        if open_categories:
+            if word_count <= 3:
+                matched = ['short_messages']
+            elif word_count <= 10:
+                matched = ['medium_messages']
+            else:
+                matched = ['long_messages']
+            
+            if last_char == '?':
+                matched.append('questions')
+            
+            if last_char == '!':
+                matched.append('exclamations')
+            
+            # Casual responses (short, common words)
+            if _CASUAL_RE.search(content_lower):
+                matched.append('casual_responses')
+            
+            if emojis:
+                matched.append('with_emojis')
+            
+            for category in matched:
+                category_examples = examples[category]
+                if len(category_examples) < _EXAMPLES_PER_CATEGORY:
+                    category_examples.append(content)
+                    if len(category_examples) == _EXAMPLES_PER_CATEGORY:
+                        open_categories -= 1
+    
+    scan.reply_count = reply_count
+    scan.mention_count = mention_count
+    scan.reaction_count = reaction_count
+    scan.attachment_count = attachment_count
+    scan.embed_count = embed_count
+    scan.style_patterns = {
+        'all_caps_messages': all_caps,
+        'question_messages': questions,
+        'exclamation_messages': exclamations,
+        'ellipsis_usage': ellipses,
+        'repeated_punctuation': repeated_punctuation,
+        'starts_with_lowercase': lowercase_starts,
+        'no_punctuation_end': unterminated
+    }
+    return scan
 
 class StyleAnalyzer:
-    def __init__(self, messages_file: str):
+    def __init__(self, messages_file: str, workers: int = 1):
         self.messages_file = messages_file
+        self.workers = workers
         self.messages = []
+        # Stripped and lowercased content, parallel to self.messages
+        self._contents = []
+        self._lowers = []
         self.style_profile = {}
         
     def load_messages(self):
         """Load messages from JSON file"""
-        with open(self.messages_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            self.messages = data['messages']
+        with open(self.messages_file, 'rb') as f:
+            data = json.loads(f.read())
+        # The crawler writes channels as they are crawled; the examples want the earliest messages
+        self.messages = sorted(data['messages'], key=itemgetter('timestamp'))
+        self._contents = [msg['content'].strip() for msg in self.messages]
+        self._lowers = [content.lower() for content in self._contents]
         
         print(f"✅ Loaded {len(self.messages)} messages")
         
-    def analyze_basic_stats(self) -> Dict[str, Any]:
+    def _scan_messages(self) -> _MessageScan:
+        """Scan all messages, split across worker processes when worthwhile"""
+        if self.workers <= 1 or len(self.messages) < _MIN_PARALLEL_MESSAGES:
+            return _scan_chunk(map(_MESSAGE_FIELDS, self.messages), self._contents, self._lowers)
+        
+        # Workers only get the fields they read, which keeps pickling cheap
+        rows = list(map(_MESSAGE_FIELDS, self.messages))
+        chunk_size = -(-len(rows) // self.workers)
+        bounds = range(0, len(rows), chunk_size)
+        with ProcessPoolExecutor(max_workers=len(bounds)) as executor:
+            scans = list(executor.map(
+                _scan_chunk,
+                [rows[i:i + chunk_size] for i in bounds],
+                [self._contents[i:i + chunk_size] for i in bounds],
+                [self._lowers[i:i + chunk_size] for i in bounds]
+            ))
+        
+        # Chunks come back in message order, so merged examples stay the first ones
+        scan = scans[0]
+        for chunk_scan in scans[1:]:
+            scan.merge(chunk_scan)
+        return scan
+        
+    def analyze_basic_stats(self, scan: _MessageScan) -> Dict[str, Any]:
         """Analyze basic message statistics"""
         if not self.messages:
             return {}
             
-        message_lengths = []
-        word_counts = []
-        char_counts = []
-        
-        for msg in self.messages:
-            content = msg['content'].strip()
-            if content:  # Skip empty messages
-                message_lengths.append(len(content))
-                words = len(content.split())
-                word_counts.append(words)
-                char_counts.append(len(content))
+        # Sorted once for the medians and the length range
+        message_lengths = sorted(scan.message_lengths)
+        word_counts = sorted(scan.word_counts)
+        avg_message_length = sum(message_lengths) / len(message_lengths) if message_lengths else 0
         
         return {
             'total_messages': len(self.messages),
             'non_empty_messages': len(message_lengths),
-            'avg_message_length': statistics.mean(message_lengths) if message_lengths else 0,
-            'median_message_length': statistics.median(message_lengths) if message_lengths else 0,
-            'avg_word_count': statistics.mean(word_counts) if word_counts else 0,
-            'median_word_count': statistics.median(word_counts) if word_counts else 0,
-            'avg_char_count': statistics.mean(char_counts) if char_counts else 0,
+            'avg_message_length': avg_message_length,
+            'median_message_length': _median(message_lengths),
+            'avg_word_count': sum(word_counts) / len(word_counts) if word_counts else 0,
+            'median_word_count': _median(word_counts),
+            'avg_char_count': avg_message_length,  # Characters are the message length
             'message_length_range': {
-                'min': min(message_lengths) if message_lengths else 0,
-                'max': max(message_lengths) if message_lengths else 0
+                'min': message_lengths[0] if message_lengths else 0,
+                'max': message_lengths[-1] if message_lengths else 0
             }
         }
     
-    def analyze_vocabulary(self) -> Dict[str, Any]:
+    def analyze_vocabulary(self, scan: _MessageScan) -> Dict[str, Any]:
         """Analyze vocabulary patterns"""
-        all_text = ' '.join([msg['content'] for msg in self.messages])
-        
-        # Word frequency
-        words = re.findall(r'\b\w+\b', all_text.lower())
-        word_freq = Counter(words)
-        
-        # Common phrases (2-3 word combinations)
-        phrases_2 = []
-        phrases_3 = []
-        
-        for msg in self.messages:
-            content = msg['content'].lower()
-            words = re.findall(r'\b\w+\b', content)
-            
-            # 2-word phrases
-            for i in range(len(words) - 1):
-                phrases_2.append(f"{words[i]} {words[i+1]}")
-            
-            # 3-word phrases
-            for i in range(len(words) - 2):
-                phrases_3.append(f"{words[i]} {words[i+1]} {words[i+2]}")
-        
-        phrase_freq_2 = Counter(phrases_2)
-        phrase_freq_3 = Counter(phrases_3)
+        word_freq = scan.word_freq
+        total_words = scan.total_words
         
         return {
-            'total_words': len(words),
+            'total_words': total_words,
             'unique_words': len(word_freq),
-            'vocabulary_richness': len(word_freq) / len(words) if words else 0,
+            'vocabulary_richness': len(word_freq) / total_words if total_words else 0,
             'most_common_words': word_freq.most_common(20),
-            'most_common_2word_phrases': phrase_freq_2.most_common(10),
-            'most_common_3word_phrases': phrase_freq_3.most_common(10)
+            'most_common_2word_phrases': _join_phrases(scan.phrase_freq_2.most_common(10)),
+            'most_common_3word_phrases': _join_phrases(scan.phrase_freq_3.most_common(10))
         }
     
-    def analyze_punctuation_and_style(self) -> Dict[str, Any]:
+    def analyze_punctuation_and_style(self, scan: _MessageScan) -> Dict[str, Any]:
         """Analyze punctuation and writing style patterns"""
-        punctuation_counts = Counter()
-        style_patterns = {
-            'all_caps_messages': 0,
-            'question_messages': 0,
-            'exclamation_messages': 0,
-            'ellipsis_usage': 0,
-            'repeated_punctuation': 0,
-            'starts_with_lowercase': 0,
-            'no_punctuation_end': 0
-        }
-        
-        for msg in self.messages:
-            content = msg['content'].strip()
-            if not content:
-                continue
-                
-            # Count punctuation
-            for char in content:
-                if char in '.,!?;:-()[]{}"\'/\\':
-                    punctuation_counts[char] += 1
-            
-            # Style patterns
-            if content.isupper() and len(content) > 3:
-                style_patterns['all_caps_messages'] += 1
-            
-            if content.endswith('?'):
-                style_patterns['question_messages'] += 1
-                
-            if content.endswith('!'):
-                style_patterns['exclamation_messages'] += 1
-                
-            if '...' in content:
-                style_patterns['ellipsis_usage'] += 1
-                
-            # Repeated punctuation (!!!, ???, etc.)
-            if re.search(r'[!?]{2,}', content):
-                style_patterns['repeated_punctuation'] += 1
-                
-            # Starts with lowercase
-            if content[0].islower():
-                style_patterns['starts_with_lowercase'] += 1
-                
-            # No ending punctuation
-            if not re.search(r'[.!?]$', content):
-                style_patterns['no_punctuation_end'] += 1
+        style_patterns = scan.style_patterns
+        percent = _percent_of(len(self.messages))
         
         return {
-            'punctuation_frequency': dict(punctuation_counts.most_common()),
+            'punctuation_frequency': dict(scan.punctuation_counts),
             'style_patterns': style_patterns,
             'style_percentages': {
-                key: (value / len(self.messages)) * 100 
+                key: value * percent
                 for key, value in style_patterns.items()
             }
         }
     
-    def analyze_emojis(self) -> Dict[str, Any]:
+    def analyze_emojis(self, scan: _MessageScan) -> Dict[str, Any]:
         """Analyze emoji usage patterns"""
-        emoji_pattern = re.compile(r'[\U0001F600-\U0001F64F'  # emoticons
-                                  r'\U0001F300-\U0001F5FF'   # symbols & pictographs
-                                  r'\U0001F680-\U0001F6FF'   # transport & map
-                                  r'\U0001F1E0-\U0001F1FF'   # flags
-                                  r'\U00002600-\U000026FF'   # miscellaneous
-                                  r'\U00002700-\U000027BF]+') # dingbats
-        
-        all_emojis = []
-        messages_with_emojis = 0
-        
-        for msg in self.messages:
-            content = msg['content']
-            emojis = emoji_pattern.findall(content)
-            if emojis:
-                messages_with_emojis += 1
-                all_emojis.extend(emojis)
-        
-        emoji_freq = Counter(all_emojis)
+        emoji_freq = scan.emoji_freq
+        total_emojis = sum(emoji_freq.values())
+        n = len(self.messages)
         
         return {
-            'total_emojis': len(all_emojis),
+            'total_emojis': total_emojis,
             'unique_emojis': len(emoji_freq),
-            'messages_with_emojis': messages_with_emojis,
-            'emoji_usage_percentage': (messages_with_emojis / len(self.messages)) * 100,
+            'messages_with_emojis': scan.messages_with_emojis,
+            'emoji_usage_percentage': scan.messages_with_emojis * _percent_of(n),
             'most_common_emojis': emoji_freq.most_common(10),
-            'avg_emojis_per_message': len(all_emojis) / len(self.messages)
+            'avg_emojis_per_message': total_emojis / n if n else 0
         }
     
-    def analyze_temporal_patterns(self) -> Dict[str, Any]:
+    def analyze_temporal_patterns(self, scan: _MessageScan) -> Dict[str, Any]:
         """Analyze when messages are sent"""
-        hours = []
-        days = []
-        
-        for msg in self.messages:
-            timestamp = datetime.fromisoformat(msg['timestamp'].replace('Z', '+00:00'))
-            hours.append(timestamp.hour)
-            days.append(timestamp.strftime('%A'))
-        
-        hour_freq = Counter(hours)
-        day_freq = Counter(days)
+        hour_freq = Counter({hour: count for hour, count in enumerate(scan.hour_counts) if count})
+        day_freq = Counter({
+            calendar.day_name[weekday]: count
+            for weekday, count in enumerate(scan.day_counts) if count
+        })
         
         return {
             'most_active_hours': hour_freq.most_common(5),
-            'least_active_hours': hour_freq.most_common()[-5:],
+            # Same entries and order as most_common()[-5:] without sorting every hour
+            'least_active_hours': nsmallest(5, reversed(hour_freq.items()), key=itemgetter(1))[::-1],
             'most_active_days': day_freq.most_common(),
             'hour_distribution': dict(hour_freq),
             'day_distribution': dict(day_freq)
         }
     
-    def analyze_interaction_patterns(self) -> Dict[str, Any]:
+    def analyze_interaction_patterns(self, scan: _MessageScan) -> Dict[str, Any]:
         """Analyze how user interacts (replies, mentions, etc.)"""
-        reply_count = 0
-        mention_count = 0
-        reaction_count = 0
-        attachment_count = 0
-        embed_count = 0
-        
-        mentioned_users = []
-        
-        for msg in self.messages:
-            if msg['reply_to']:
-                reply_count += 1
-                
-            if msg['mentions']:
-                mention_count += 1
-                mentioned_users.extend(msg['mentions'])
-                
-            if msg['reactions']:
-                reaction_count += len(msg['reactions'])
-                
-            if msg['attachments']:
-                attachment_count += len(msg['attachments'])
-                
-            if msg['embeds']:
-                embed_count += msg['embeds']
-        
-        mention_freq = Counter(mentioned_users)
+        percent = _percent_of(len(self.messages))
         
         return {
-            'reply_percentage': (reply_count / len(self.messages)) * 100,
-            'mention_percentage': (mention_count / len(self.messages)) * 100,
-            'messages_with_reactions': reaction_count,
-            'messages_with_attachments': attachment_count,
-            'messages_with_embeds': embed_count,
-            'most_mentioned_users': mention_freq.most_common(5)
+            'reply_percentage': scan.reply_count * percent,
+            'mention_percentage': scan.mention_count * percent,
+            'messages_with_reactions': scan.reaction_count,
+            'messages_with_attachments': scan.attachment_count,
+            'messages_with_embeds': scan.embed_count,
+            'most_mentioned_users': scan.mention_freq.most_common(5)
         }
     
-    def extract_example_messages(self) -> Dict[str, List[str]]:
+    def extract_example_messages(self, scan: _MessageScan) -> Dict[str, List[str]]:
         """Extract example messages for different categories"""
-        examples = {
-            'short_messages': [],
-            'medium_messages': [],
-            'long_messages': [],
-            'questions': [],
-            'exclamations': [],
-            'casual_responses': [],
-            'with_emojis': []
-        }
-        
-        emoji_pattern = re.compile(r'[\U0001F600-\U0001F64F'
-                                  r'\U0001F300-\U0001F5FF'
-                                  r'\U0001F680-\U0001F6FF'
-                                  r'\U0001F1E0-\U0001F1FF'
-                                  r'\U00002600-\U000026FF'
-                                  r'\U00002700-\U000027BF]+')
-        
-        for msg in self.messages:
-            content = msg['content'].strip()
-            if not content:
-                continue
-                
-            word_count = len(content.split())
-            
-            # Categorize by length
-            if word_count <= 3:
-                if len(examples['short_messages']) < 10:
-                    examples['short_messages'].append(content)
-            elif word_count <= 10:
-                if len(examples['medium_messages']) < 10:
-                    examples['medium_messages'].append(content)
-            else:
-                if len(examples['long_messages']) < 10:
-                    examples['long_messages'].append(content)
-            
-            # Questions
-            if content.endswith('?') and len(examples['questions']) < 10:
-                examples['questions'].append(content)
-            
-            # Exclamations
-            if content.endswith('!') and len(examples['exclamations']) < 10:
-                examples['exclamations'].append(content)
-            
-            # Casual responses (short, common words)
-            casual_words = ['ok', 'yeah', 'lol', 'lmao', 'bruh', 'nice', 'cool', 'true', 'fr', 'nah']
-            if any(word in content.lower() for word in casual_words) and len(examples['casual_responses']) < 10:
-                examples['casual_responses'].append(content)
-            
-            # With emojis
-            if emoji_pattern.search(content) and len(examples['with_emojis']) < 10:
-                examples['with_emojis'].append(content)
-        
-        return examples
+        return scan.examples
     
     def generate_style_profile(self) -> Dict[str, Any]:
         """Generate complete style profile"""
         print("\n🔍 Analyzing writing style...")
         
-        basic_stats = self.analyze_basic_stats()
+        scan = self._scan_messages()
+        
+        basic_stats = self.analyze_basic_stats(scan)
         print("  ✅ Basic statistics")
         
-        vocabulary = self.analyze_vocabulary()
+        vocabulary = self.analyze_vocabulary(scan)
         print("  ✅ Vocabulary analysis")
         
-        punctuation = self.analyze_punctuation_and_style()
+        punctuation = self.analyze_punctuation_and_style(scan)
         print("  ✅ Punctuation & style patterns")
         
-        emojis = self.analyze_emojis()
+        emojis = self.analyze_emojis(scan)
         print("  ✅ Emoji usage")
         
-        temporal = self.analyze_temporal_patterns()
+        temporal = self.analyze_temporal_patterns(scan)
         print("  ✅ Temporal patterns")
         
-        interactions = self.analyze_interaction_patterns()
+        interactions = self.analyze_interaction_patterns(scan)
         print("  ✅ Interaction patterns")
         
-        examples = self.extract_example_messages()
+        examples = self.extract_example_messages(scan)
         print("  ✅ Example messages")
         
         self.style_profile = {
@@ -346,11 +457,12 @@ class StyleAnalyzer:
         # Ensure directory exists
         Path(output_file).parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.style_profile, f, indent=2, ensure_ascii=False)
+        serialized = json.dumps(self.style_profile, indent=2, ensure_ascii=False).encode('utf-8')
+        with open(output_file, 'wb') as f:
+            f.write(serialized)
         
         print(f"\n💾 Style profile saved to: {output_file}")
-        print(f"📊 File size: {Path(output_file).stat().st_size / 1024:.2f} KB")
+        print(f"📊 File size: {len(serialized) / 1024:.2f} KB")
         
         return output_file
     
@@ -405,17 +517,19 @@ def main():
         print("❌ No data/raw directory found!")
         return
         
-    message_files = list(data_dir.glob('pyqwerty_messages_*.json'))
+    with os.scandir(data_dir) as entries:
+        message_files = [entry for entry in entries
+                         if entry.name.startswith('pyqwerty_messages_') and entry.name.endswith('.json')]
     if not message_files:
         print("❌ No message files found in data/raw/")
         return
         
     # Use the most recent file
-    latest_file = max(message_files, key=lambda x: x.stat().st_mtime)
+    latest_file = max(message_files, key=lambda entry: entry.stat().st_mtime).path
     print(f"📁 Using message file: {latest_file}")
     
     # Analyze style
-    analyzer = StyleAnalyzer(str(latest_file))
+    analyzer = StyleAnalyzer(latest_file, workers=os.cpu_count() or 1)
     analyzer.load_messages()
     analyzer.generate_style_profile()
     analyzer.print_summary()
@@ -5,6 +5,7 @@ Test script for PyQwerty Bot components
 
 import asyncio
 import sys
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -18,6 +19,21 @@ from src.ai.llm_client import OpenRouterClient
 from src.ai.prompt_builder import PromptBuilder
 from src.ai.style_validator import StyleValidator
 
+# Style validator inputs and what each one should demonstrate
+STYLE_TEST_CASES = (
+    ("This is a formal response with proper capitalization.", "Expected: lowercase conversion"),
+    ("nah bro that's crazy fr", "Expected: pass validation"),
+    ("DAMN that's actually insane what the hell!", "Expected: keep ALL-CAPS emphasis"),
+    ("Yeah, I think that's a good idea.", "Expected: remove punctuation, lowercase"),
+    ("<@123456789> hey bro what's up", "Expected: remove all mentions"),
+    ("<@!987654321> yo <@555555555> check this out", "Expected: remove multiple mentions")
+)
+
+@lru_cache(maxsize=None)
+def get_style_validator() -> StyleValidator:
+    """Shared validator, so the style profile is only loaded once per run"""
+    return StyleValidator()
+
 async def test_llm_client():
     """Test OpenRouter connection"""
     print("🧪 Testing OpenRouter client...")
@@ -84,21 +100,9 @@ def test_style_validator():
     print("\n🧪 Testing style validator...")
     
     try:
-        validator = StyleValidator()
-        
-        # Test responses
-        test_cases = [
-            ("This is a formal response with proper capitalization.", "Expected: lowercase conversion"),
-            ("nah bro that's crazy fr", "Expected: pass validation"),
-            ("DAMN that's actually insane what the hell!", "Expected: keep ALL-CAPS emphasis"),
-            ("Yeah, I think that's a good idea.", "Expected: remove punctuation, lowercase"),
-            ("<@123456789> hey bro what's up", "Expected: remove all mentions"),
-            ("<@!987654321> yo <@555555555> check this out", "Expected: remove multiple mentions")
-        ]
-        
-        all_passed = True
+        validator = get_style_validator()
         
-        for test_input, expected in test_cases:
+        for test_input, expected in STYLE_TEST_CASES:
             # Test mention removal (no bot ID needed now)
             result = validator.validate_and_adjust(test_input)
             stats = validator.get_response_stats(result)
@@ -124,7 +128,7 @@ async def test_full_pipeline():
         # Initialize components
         llm_client = OpenRouterClient()
         prompt_builder = PromptBuilder()
-        style_validator = StyleValidator()
+        style_validator = get_style_validator()
         
         # Sample conversation
         sample_messages = [